@@ -6,19 +6,41 @@ A CLI tool for managing multiple git profiles with configurations.
 
 import os
 import sys
-import json
-import shutil
+import datetime
+import shlex
 import subprocess
 import argparse
 from pathlib import Path
 from typing import Dict, List, Optional
 
+# shutil, json and configparser are imported inside the methods that use them,
+# keeping read-only commands fast to start
+
+# Environment for gitctx's own bookkeeping git calls: never page, prompt or take optional locks.
+# push/pull/clone keep the user's environment so credential prompts still work.
+GIT_ENV = {**os.environ, 'GIT_PAGER': 'cat', 'GIT_OPTIONAL_LOCKS': '0', 'GIT_TERMINAL_PROMPT': '0'}
+
+# Bookkeeping commits skip signing and hooks configured in the user's global gitconfig
+GIT_COMMIT = 'git -c commit.gpgsign=false -c core.hooksPath=/dev/null commit'
+
 class GitCtx:
+    # fzf location, looked up on first use and shared by all instances
+    _fzf_path = None
+    _fzf_probed = False
+
     def __init__(self):
-        self.config_dir = Path.home() / '.config' / 'gitctx'
+        self._home = Path.home()
+        self._home_resolved = self._home.resolve()
+        self.config_dir = self._home / '.config' / 'gitctx'
         self.profiles_dir = self.config_dir / 'profiles'
         self.repo_dir = self.config_dir
         self.metadata_file = self.config_dir / 'metadata.json'
+        # String forms for subprocess cwd and os-level calls, converted once
+        self.config_dir_str = str(self.config_dir)
+        self.metadata_file_str = str(self.metadata_file)
+        self._metadata = None
+        self._metadata_fingerprint = None
+        self._metadata_dirty = False
 
     def initialize_repo(self, repo_url: Optional[str] = None):
         """Initialize the gitctx configuration repository."""
@@ -29,14 +51,14 @@ class GitCtx:
         if repo_url:
             # Clone existing repository
             try:
-                subprocess.run(['git', 'clone', repo_url, str(self.config_dir)], check=True, capture_output=True)
+                subprocess.run(['git', 'clone', repo_url, self.config_dir_str], check=True, capture_output=True)
                 print(f"✅ Cloned gitctx repository from {repo_url} to {self.config_dir}")
                 
                 # 👇 Immediately unset active_profile to avoid accidental overwrites
                 metadata = self._load_metadata()
                 metadata['active_profile'] = None
                 self._save_metadata(metadata)
-                self._commit_changes("Unset active profile after clone")
+                self._commit_changes("Unset active profile after clone", [])
                 print("⚠️  Active profile unset to avoid accidental overwrites")
             except subprocess.CalledProcessError as e:
                 print(f"❌ Failed to clone repository: {e}")
@@ -45,10 +67,7 @@ class GitCtx:
             # Create new repository
             self.config_dir.mkdir(parents=True)
             self.profiles_dir.mkdir()
-            
-            # Initialize git repo
-            subprocess.run(['git', 'init'], cwd=self.config_dir, check=True, capture_output=True)
-            
+
             # Create initial metadata
             metadata = {
                 'version': '1.0',
@@ -56,6 +75,7 @@ class GitCtx:
                 'active_profile': None
             }
             self._save_metadata(metadata)
+            self.flush()
             
             # Create .gitignore
             gitignore_content = """# gitctx generated files
@@ -64,58 +84,203 @@ class GitCtx:
     """
             (self.config_dir / '.gitignore').write_text(gitignore_content)
             
-            # Initial commit
-            subprocess.run(['git', 'add', '.'], cwd=self.config_dir, check=True, capture_output=True)
-            subprocess.run(['git', 'commit', '-m', 'Initial gitctx setup'], 
-                        cwd=self.config_dir, check=True, capture_output=True)
+            # Initialize git repo and make the initial commit in a single shell
+            subprocess.run(['/bin/sh', '-c', f'git init && git add . && {GIT_COMMIT} -m "Initial gitctx setup"'],
+                        cwd=self.config_dir_str, env=GIT_ENV, check=True, capture_output=True)
             
             print(f"✅ Initialized gitctx repository at {self.config_dir}")
 
     
     def _save_metadata(self, metadata: Dict):
-        """Save metadata to file."""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        """Mark metadata as modified; it is written to disk by flush()."""
+        self._metadata = metadata
+        self._metadata_dirty = True
+
+    def flush(self):
+        """Write pending metadata changes to file."""
+        if not self._metadata_dirty:
+            return
+        # Write to a temporary file and rename it over the original so a crash never leaves it truncated
+        tmp_file = self.metadata_file.with_suffix('.json.tmp')
+        import json
+        data = json.dumps(self._metadata, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            # The rename below keeps the mtime, so this is also the final file's fingerprint
+            file_stat = os.fstat(f.fileno())
+        os.replace(tmp_file, self.metadata_file_str)
+        self._metadata_fingerprint = (file_stat.st_mtime_ns, file_stat.st_size)
+        self._metadata_dirty = False
     
     def _load_metadata(self) -> Dict:
-        """Load metadata from file."""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        return {'version': '1.0', 'profiles': {}, 'active_profile': None}
+        """Load metadata from file, reusing the cached copy while the file is unchanged."""
+        if self._metadata_dirty:
+            return self._metadata
+
+        try:
+            file_stat = os.stat(self.metadata_file_str)
+            fingerprint = (file_stat.st_mtime_ns, file_stat.st_size)
+        except FileNotFoundError:
+            fingerprint = None
+
+        if self._metadata is None or fingerprint != self._metadata_fingerprint:
+            if fingerprint is not None:
+                # One read() of the raw bytes; json.loads accepts bytes and skips the text wrapper
+                import json
+                with open(self.metadata_file_str, 'rb') as f:
+                    self._metadata = json.loads(f.read())
+            else:
+                self._metadata = {'version': '1.0', 'profiles': {}, 'active_profile': None}
+            self._metadata_fingerprint = fingerprint
+        return self._metadata
     
-    def _commit_changes(self, message: str):
-        """Commit changes to the config repository."""
+    def _commit_changes(self, message: str, paths: Optional[List[str]] = None):
+        """Commit changes to the config repository.
+
+        paths lists the repo-relative files or directories the caller touched; only those
+        (plus metadata.json) are staged, so git doesn't rescan the whole worktree.
+        Without paths, or if a path matches nothing on disk or in the index, everything is staged.
+        """
+        self.flush()
+        if paths is None:
+            stage = 'git add -A'
+        else:
+            pathspec = ' '.join(shlex.quote(p) for p in ['metadata.json', *paths])
+            stage = f'{{ git add -A -- {pathspec} 2>/dev/null || git add -A; }}'
+        # Exit 3 when nothing is staged, so the no-op case is detected without parsing (translated) git output
+        commit = f'{{ git diff --cached --quiet && exit 3; {GIT_COMMIT} -m {shlex.quote(message)}; }}'
         try:
-            subprocess.run(['git', 'add', '.'], cwd=self.config_dir, check=True, capture_output=True)
-            subprocess.run(['git', 'commit', '-m', message], 
-                         cwd=self.config_dir, check=True, capture_output=True)
+            # Literal pathspecs, so a profile named e.g. 'a*' doesn't stage other profiles' changes
+            subprocess.run(['/bin/sh', '-c', f'{stage} && {commit}'], cwd=self.config_dir_str,
+                         env={**GIT_ENV, 'GIT_LITERAL_PATHSPECS': '1'}, check=True, capture_output=True, text=True)
             print(f"✅ Committed: {message}")
-        except subprocess.CalledProcessError:
-            print("ℹ️ No changes to commit")
+        except subprocess.CalledProcessError as e:
+            if e.returncode == 3:
+                print("ℹ️ No changes to commit")
+            else:
+                print(f"❌ Failed to commit changes: {(e.stderr or e.stdout).strip()}")
     
+    def _copy_file(self, source_file: Path, dest_file: Path) -> bool:
+        """Copy a file's contents, mode and timestamps without copystat's xattr/flags probing.
+
+        Returns False without rewriting the contents if the destination is already
+        byte-for-byte identical to the source; only its mode is synced then.
+        """
+        source_stat = source_file.stat()
+        try:
+            dest_stat = dest_file.stat()
+        except FileNotFoundError:
+            dest_stat = None
+        if dest_stat is not None and dest_stat.st_size == source_stat.st_size:
+            import filecmp
+            # Timestamps can't prove equality: a fresh clone gives every file the same mtime
+            if filecmp.cmp(source_file, dest_file, shallow=False):
+                if dest_stat.st_mode & 0o7777 != source_stat.st_mode & 0o7777:
+                    os.chmod(dest_file, source_stat.st_mode & 0o7777)
+                return False
+
+        import shutil
+        # copyfile uses sendfile() on Linux, so data never passes through userspace
+        shutil.copyfile(source_file, dest_file)
+        os.chmod(dest_file, source_stat.st_mode & 0o7777)
+        os.utime(dest_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+
+    def _display_name(self, repo_filename: str) -> str:
+        """Map a repo filename back to the original name (dot_bashrc -> bashrc)."""
+        return repo_filename[4:] if repo_filename.startswith('dot_') else repo_filename
+
+    def _read_gitconfig_user(self, gitconfig_path: Path):
+        """Read user.name and user.email from a gitconfig file."""
+        import configparser
+        user_name = user_email = None
+        try:
+            # gitconfig indents keys with tabs, which configparser would treat as continuations
+            content = '\n'.join(line.strip() for line in gitconfig_path.read_text(encoding='utf-8').splitlines())
+            cp = configparser.ConfigParser(strict=False, interpolation=None, allow_no_value=True,
+                                           inline_comment_prefixes=('#', ';'))
+            cp.read_string(content)
+            user_name = cp.get('user', 'name', fallback=None)
+            user_email = cp.get('user', 'email', fallback=None)
+        except (OSError, ValueError, configparser.Error):  # ValueError covers non-UTF-8 files
+            pass
+        if user_name and user_email:
+            return user_name.strip('"'), user_email.strip('"')
+
+        # Fall back to a single git invocation for anything configparser couldn't find:
+        # git also handles case-insensitive section names, includes and ~/.config/git/config
+        try:
+            result = subprocess.run(['git', 'config', '--global', '--get-regexp', r'^user\.(name|email)$'],
+                                    capture_output=True, encoding='utf-8', errors='replace')
+            values = dict(line.split(' ', 1) for line in result.stdout.splitlines() if ' ' in line)
+        except Exception:
+            values = {}
+        user_name = user_name.strip('"') if user_name else values.get('user.name', "Unknown")
+        user_email = user_email.strip('"') if user_email else values.get('user.email', "Unknown")
+        return user_name, user_email
+
+    def _read_char_yn(self, prompt: str) -> str:
+        """Read a single-keystroke answer to a y/n prompt, lowercased ('' for Enter)."""
+        try:
+            import termios
+            import tty
+        except ImportError:  # Not POSIX (e.g. Windows)
+            termios = None
+        if termios is None or not sys.stdin.isatty():
+            return input(prompt).strip()[:1].lower()
+
+        print(prompt, end='', flush=True)
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setraw(fd)
+            # Read one byte straight from the fd so sys.stdin's buffer doesn't keep the rest of a paste
+            char = os.read(fd, 1).decode('ascii', errors='ignore')
+        finally:
+            # TCSAFLUSH discards the remaining input (pasted text, arrow-key escape sequences)
+            termios.tcsetattr(fd, termios.TCSAFLUSH, old_settings)
+
+        # Raw mode delivers Ctrl+C / Ctrl+D as characters instead of signals
+        if char == '\x03':
+            raise KeyboardInterrupt
+        if char == '\x04':
+            raise EOFError
+        char = char if char.isprintable() else ''
+        print(char)
+        return char.lower()
+
     def _get_fzf_selection(self, options: List[str], prompt: str = "Select profile") -> Optional[str]:
         """Use fzf for selection if available, otherwise use simple input."""
         if not options:
             return None
             
         # Check if fzf is available
-        try:
-            subprocess.run(['which', 'fzf'], check=True, capture_output=True)
-            use_fzf = True
-        except subprocess.CalledProcessError:
-            use_fzf = False
+        if not GitCtx._fzf_probed:
+            import shutil
+            GitCtx._fzf_path = shutil.which('fzf')
+            GitCtx._fzf_probed = True
+        use_fzf = self._fzf_path is not None
         
         if use_fzf:
             try:
                 process = subprocess.Popen(
-                    ['fzf', '--prompt', f'{prompt}: ', '--height', '40%'],
+                    [self._fzf_path, '--prompt', f'{prompt}: ', '--height', '40%', '--tiebreak=index'],
                     stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=None,  # Let stderr go to terminal
                     text=True
                 )
-                stdout, _ = process.communicate('\n'.join(options))
+                # Stream options so fzf can start rendering before the whole list is written
+                try:
+                    for option in options:
+                        process.stdin.write(option + '\n')
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass  # fzf exited (selection made or cancelled) before reading everything
+                stdout = process.stdout.read()
+                process.wait()
                 if process.returncode == 0 and stdout.strip():
                     return stdout.strip()
                 elif process.returncode == 130:  # Ctrl+C in fzf
@@ -171,7 +336,7 @@ class GitCtx:
         metadata = self._load_metadata()
         metadata['profiles'][profile_name] = {
             'type': 'new',
-            'created_at': subprocess.check_output(['date', '-Iseconds']).decode().strip(),
+            'created_at': datetime.datetime.now().astimezone().isoformat(timespec='seconds'),
             'user_name': name,
             'user_email': email,
             'files': {
@@ -180,7 +345,7 @@ class GitCtx:
         }
         self._save_metadata(metadata)
         
-        self._commit_changes(f"Add new profile: {profile_name}")
+        self._commit_changes(f"Add new profile: {profile_name}", [f"profiles/{profile_name}"])
         print(f"✅ Created new profile '{profile_name}'")
     
     def remove_profile(self, profile_name: str = None):
@@ -200,14 +365,15 @@ class GitCtx:
             return
         
         # Confirm removal
-        confirm = input(f"Are you sure you want to remove profile '{profile_name}'? (y/N): ")
-        if confirm.lower() != 'y':
+        confirm = self._read_char_yn(f"Are you sure you want to remove profile '{profile_name}'? (y/N): ")
+        if confirm != 'y':
             print("❌ Removal cancelled")
             return
         
         # Remove profile directory
         profile_dir = self.profiles_dir / profile_name
         if profile_dir.exists():
+            import shutil
             shutil.rmtree(profile_dir)
         
         # Update metadata
@@ -216,7 +382,7 @@ class GitCtx:
             metadata['active_profile'] = None
         self._save_metadata(metadata)
         
-        self._commit_changes(f"Remove profile: {profile_name}")
+        self._commit_changes(f"Remove profile: {profile_name}", [f"profiles/{profile_name}"])
         print(f"✅ Removed profile '{profile_name}'")
 
     def print_status(self):
@@ -228,8 +394,11 @@ class GitCtx:
             print("📝 No profiles found. Use 'gitctx add-new' or 'gitctx add-current' to create one.")
             return
         
+        # Build the output in one buffer and write it once
+        buf = []
+
         # Print only the active profile if it exists
-        print("\n📋 Active profile:")
+        buf.append("\n📋 Active profile:\n")
         active = metadata.get('active_profile')
         
         for name, info in profiles.items():
@@ -238,51 +407,59 @@ class GitCtx:
             created = info.get('created_at', 'unknown')
             
             if name == active:
-                print(f"  {status} {name} ({profile_type})")
+                buf.append(f"  {status} {name} ({profile_type})\n")
                 if 'user_name' in info:
-                    print(f"    👤 {info['user_name']} <{info['user_email']}>")
-                print(f"    📅 Created: {created}")
+                    buf.append(f"    👤 {info['user_name']} <{info['user_email']}>\n")
+                buf.append(f"    📅 Created: {created}\n")
                 
                 # List tracked files
                 files = info.get('files', {})
                 if files:
-                    print(f"    📁 Files: {', '.join(files.keys())}")
+                    buf.append(f"    📁 Files: {', '.join(files.keys())}\n")
 
-                # List hooks
+                # List hooks (old-format entries are plain path strings without hooks)
                 pre_hooks = []
                 post_hooks = []
                 for f, props in files.items():
-                    hook = props.get("hook")
+                    hook = props.get("hook") if isinstance(props, dict) else None
                     if hook == "pre-apply":
                         pre_hooks.append(f)
                     elif hook == "post-apply":
                         post_hooks.append(f)
                 
                 if pre_hooks:
-                    print(f"    🪝 pre-applys: {', '.join(pre_hooks)}")
+                    buf.append(f"    🪝 pre-applys: {', '.join(pre_hooks)}\n")
 
                 if post_hooks:
-                    print(f"    🪝 post-applys: {', '.join(post_hooks)}")
+                    buf.append(f"    🪝 post-applys: {', '.join(post_hooks)}\n")
 
 
         # Print number of profiles
-        print(f"\n📊 Total profiles: {len(profiles)}")
+        buf.append(f"\n📊 Total profiles: {len(profiles)}\n")
 
         # Print pending commits
+        pending = self._count_pending_commits()
+        if pending is not None:
+            buf.append(f"\n⬆️  {pending} commits pending to push\n\n")
+        else:
+            buf.append("❌ Failed to count pending push commits\n")
+
+        sys.stdout.write(''.join(buf))
+
+    def _count_pending_commits(self) -> Optional[int]:
+        """Count local commits not yet pushed upstream, or None if it can't be determined."""
         try:
             result = subprocess.run(
                 ['git', 'rev-list', '--count', '@{u}..'],
-                cwd=self.config_dir,
+                cwd=self.config_dir_str,
+                env=GIT_ENV,
                 check=True,
                 capture_output=True,
                 text=True
             )
-            pending = int(result.stdout.strip())
-            print()
-            print(f"⬆️  {pending} commits pending to push")
-            print()
-        except subprocess.CalledProcessError as e:
-            print("❌ Failed to count pending push commits")
+            return int(result.stdout.strip())
+        except subprocess.CalledProcessError:
+            return None
 
     def list_profiles(self):
         """List all available profiles."""
@@ -293,7 +470,8 @@ class GitCtx:
             print("📝 No profiles found. Use 'gitctx add-new' or 'gitctx add-current' to create one.")
             return
         
-        print("\n📋 Available profiles:")
+        # Build the output in one buffer and write it once
+        buf = ["\n📋 Available profiles:\n"]
         active = metadata.get('active_profile')
         
         for name, info in profiles.items():
@@ -301,16 +479,17 @@ class GitCtx:
             profile_type = info.get('type', 'unknown')
             created = info.get('created_at', 'unknown')
             
-            print(f"  {status} {name} ({profile_type})")
+            buf.append(f"  {status} {name} ({profile_type})\n")
             if 'user_name' in info:
-                print(f"    👤 {info['user_name']} <{info['user_email']}>")
-            print(f"    📅 Created: {created}")
+                buf.append(f"    👤 {info['user_name']} <{info['user_email']}>\n")
+            buf.append(f"    📅 Created: {created}\n")
             
             # List tracked files
             files = info.get('files', {})
             if files:
-                print(f"    📁 Files: {', '.join(files.keys())}")
-        print()
+                buf.append(f"    📁 Files: {', '.join(files.keys())}\n")
+        buf.append("\n")
+        sys.stdout.write(''.join(buf))
     
     def switch_profile(self, profile_name: str = None, no_hooks = False):
 
@@ -343,9 +522,12 @@ class GitCtx:
         
         # Copy all tracked files to their destination paths
         files_copied = []
-        home_path = Path.home()
+        created_dirs = set()
+        home_path = self._home
+        files = profile_info.get('files', {})
+        display_names = {rf: self._display_name(rf) for rf in files}
         
-        for repo_filename, file_info in profile_info.get('files', {}).items():
+        for repo_filename, file_info in files.items():
             source_file = profile_dir / repo_filename
 
             # Handle both old format (string) and new format (dict)
@@ -368,15 +550,20 @@ class GitCtx:
             
             if source_file.exists():
                 # Create destination directory if it doesn't exist
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                if dest_file.parent not in created_dirs:
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(dest_file.parent)
                 
                 # Copy file to destination
-                shutil.copy2(source_file, dest_file)
+                copied = self._copy_file(source_file, dest_file)
 
                 # Show original filename in output
-                original_filename = repo_filename[4:] if repo_filename.startswith('dot_') else repo_filename
+                original_filename = display_names[repo_filename]
                 files_copied.append(original_filename)
-                print(f"✅ Applied {original_filename} to {dest_file}")
+                if copied:
+                    print(f"✅ Applied {original_filename} to {dest_file}")
+                else:
+                    print(f"✅ {original_filename} already up to date at {dest_file}")
 
                 # Apply stored permissions if available
                 if file_permissions:
@@ -402,7 +589,7 @@ class GitCtx:
         metadata['active_profile'] = profile_name
         self._save_metadata(metadata)
         
-        self._commit_changes(f"Switch to profile: {profile_name}")
+        self._commit_changes(f"Switch to profile: {profile_name}", [])
         print(f"🔄 Switched to profile '{profile_name}'")
 
     # Update list_profile_files method to show relative paths properly
@@ -427,31 +614,38 @@ class GitCtx:
             print(f"❌ Profile directory not found: {profile_dir}")
             return
         
-        print(f"\n📁 Files in profile '{profile_name}':")
+        # Build the output in one buffer and write it once
+        buf = [f"\n📁 Files in profile '{profile_name}':\n"]
         
         profile_info = metadata['profiles'][profile_name]
         files = profile_info.get('files', {})
         
         if not files:
-            print("  (no files tracked)")
+            buf.append("  (no files tracked)\n")
+            sys.stdout.write(''.join(buf))
             return
         
+        # Scan the profile directory once instead of probing each file separately
+        with os.scandir(profile_dir) as it:
+            entries = {entry.name: entry for entry in it}
+
         # Display tracked files with their paths and permissions
-        home_path = Path.home()
+        display_names = {rf: self._display_name(rf) for rf in files}
         for repo_filename, file_info in files.items():
-            file_path = profile_dir / repo_filename
             # Show original filename in output
-            display_filename = repo_filename[4:] if repo_filename.startswith('dot_') else repo_filename
+            display_filename = display_names[repo_filename]
             
             # Handle both old format (string) and new format (dict)
             if isinstance(file_info, str):
                 # Old format: direct path string
                 stored_path = file_info
                 file_permissions = None
+                file_hook = None
             else:
-                # New format: dict with path and permissions
+                # New format: dict with path, permissions and hook
                 stored_path = file_info.get('path')
                 file_permissions = file_info.get('permissions')
+                file_hook = file_info.get('hook')
 
             # Handle both old absolute paths and new relative paths
             if stored_path.startswith('/'):
@@ -461,28 +655,34 @@ class GitCtx:
                 # New relative path
                 dest_display = f"~/{stored_path}"
 
-            # Get hook info
-            file_hook = file_info.get('hook')
+            # Files missing from the scan are reported without a stat
+            entry = entries.get(repo_filename)
+            try:
+                file_stat = entry.stat() if entry is not None else None
+            except FileNotFoundError:  # Dangling symlink
+                file_stat = None
 
-            if file_path.exists():
-                file_size = file_path.stat().st_size
-                modified = subprocess.check_output(['date', '-r', str(file_path)]).decode().strip()
+            if file_stat is not None:
+                file_size = file_stat.st_size
+                modified = datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(timespec='seconds')
                 
-                print(f"  📄 {display_filename}")
-                print(f"    📁 Destination: {dest_display}")
+                buf.append(f"  📄 {display_filename}\n")
+                buf.append(f"    📁 Destination: {dest_display}\n")
                 if file_permissions:
-                    print(f"    🔒 Permissions: {file_permissions}")
-                print(f"    📊 {file_size:,} bytes")
-                print(f"    📅 {modified}")
+                    buf.append(f"    🔒 Permissions: {file_permissions}\n")
+                buf.append(f"    📊 {file_size:,} bytes\n")
+                buf.append(f"    📅 {modified}\n")
                 if file_hook:
-                    print(f"    🪝 Hook: {file_hook}")
-                print()
+                    buf.append(f"    🪝 Hook: {file_hook}\n")
+                buf.append("\n")
             else:
-                print(f"  ❌ {display_filename} (file missing)")
-                print(f"    📁 Destination: {dest_display}")
+                buf.append(f"  ❌ {display_filename} (file missing)\n")
+                buf.append(f"    📁 Destination: {dest_display}\n")
                 if file_permissions:
-                    print(f"    🔒 Permissions: {file_permissions}")
-                print()
+                    buf.append(f"    🔒 Permissions: {file_permissions}\n")
+                buf.append("\n")
+
+        sys.stdout.write(''.join(buf))
 
     def edit_profile(self, profile_name: str = None):
         """Edit a profile's configuration."""
@@ -507,7 +707,7 @@ class GitCtx:
         editor = os.environ.get('EDITOR', 'vim')
         try:
             subprocess.run([editor, str(gitconfig_path)], check=True)
-            self._commit_changes(f"Edit profile: {profile_name}")
+            self._commit_changes(f"Edit profile: {profile_name}", [f"profiles/{profile_name}/gitconfig"])
             print(f"✅ Updated profile '{profile_name}'")
         except subprocess.CalledProcessError:
             print("❌ Failed to edit profile")
@@ -520,7 +720,7 @@ class GitCtx:
             return
         
         # Check if global gitconfig exists
-        global_gitconfig = Path.home() / '.gitconfig'
+        global_gitconfig = self._home / '.gitconfig'
         if not global_gitconfig.exists():
             print("❌ No global .gitconfig found. Set up git first with:")
             print("    git config --global user.name 'Your Name'")
@@ -530,43 +730,39 @@ class GitCtx:
         profile_dir.mkdir()
         
         # Copy current gitconfig
-        shutil.copy2(global_gitconfig, profile_dir / 'gitconfig')
+        self._copy_file(global_gitconfig, profile_dir / 'gitconfig')
         print(f"✅ Copied .gitconfig to profile '{profile_name}'")
         
         # Extract user info from gitconfig for metadata
-        try:
-            name_result = subprocess.run(['git', 'config', '--global', 'user.name'], 
-                                    capture_output=True, text=True)
-            email_result = subprocess.run(['git', 'config', '--global', 'user.email'], 
-                                        capture_output=True, text=True)
-            
-            user_name = name_result.stdout.strip() if name_result.returncode == 0 else "Unknown"
-            user_email = email_result.stdout.strip() if email_result.returncode == 0 else "Unknown"
-        except Exception:
-            user_name = user_email = "Unknown"
+        user_name, user_email = self._read_gitconfig_user(global_gitconfig)
         
         # Update metadata
         metadata = self._load_metadata()
         metadata['profiles'][profile_name] = {
             'type': 'current',
-            'created_at': subprocess.check_output(['date', '-Iseconds']).decode().strip(),
+            'created_at': datetime.datetime.now().astimezone().isoformat(timespec='seconds'),
             'user_name': user_name,
             'user_email': user_email,
             'files': {
                 'gitconfig': '.gitconfig'  # Store as relative path
             }
         }
-        self._save_metadata(metadata)
-        
-        self._commit_changes(f"Add current profile: {profile_name}")
         print(f"✅ Added current configuration as profile '{profile_name}'")
         
-        # Offer to set as active profile
-        set_active = input(f"Set '{profile_name}' as the active profile? (Y/n): ").strip()
+        # Offer to set as active profile, committing both changes together
+        try:
+            set_active = self._read_char_yn(f"Set '{profile_name}' as the active profile? (Y/n): ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            set_active = 'n'
+        message = f"Add current profile: {profile_name}"
         if set_active.lower() != 'n':
             metadata['active_profile'] = profile_name
-            self._save_metadata(metadata)
-            self._commit_changes(f"Set active profile: {profile_name}")
+            message += " (set active)"
+        self._save_metadata(metadata)
+        
+        self._commit_changes(message, [f"profiles/{profile_name}"])
+        if metadata['active_profile'] == profile_name:
             print(f"🔄 Set '{profile_name}' as active profile")
 
     def apply_active_profile(self, no_hooks = False):
@@ -591,7 +787,8 @@ class GitCtx:
             return
 
         files_copied = []
-        home_path = Path.home()
+        created_dirs = set()
+        home_path = self._home
 
         # Execute pre-apply hooks
         if not no_hooks:
@@ -601,6 +798,7 @@ class GitCtx:
             print(f"⏩ Skipping pre-hooks execution...")  
             print(f"-----") 
 
+        display_names = {rf: self._display_name(rf) for rf in files}
         for repo_filename, file_info in files.items():
             source_file = profile_dir / repo_filename
 
@@ -617,12 +815,17 @@ class GitCtx:
             dest_file = home_path / relative_path
 
             if source_file.exists():
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_file, dest_file)
+                if dest_file.parent not in created_dirs:
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(dest_file.parent)
+                copied = self._copy_file(source_file, dest_file)
  
-                original_filename = repo_filename[4:] if repo_filename.startswith('dot_') else repo_filename
+                original_filename = display_names[repo_filename]
                 files_copied.append(original_filename)
-                print(f"✅ Applied {original_filename} to {dest_file}")
+                if copied:
+                    print(f"✅ Applied {original_filename} to {dest_file}")
+                else:
+                    print(f"✅ {original_filename} already up to date at {dest_file}")
 
                 # Apply stored permissions if available
                 if file_permissions:
@@ -644,7 +847,7 @@ class GitCtx:
         if files_copied:
             print(f"-----")
             print(f"🔁 Re-applied files: {', '.join(files_copied)}")
-            self._commit_changes(f"Re-applied profile '{profile_name}'")
+            self._commit_changes(f"Re-applied profile '{profile_name}'", [])
 
 
     def add_file(self, file_path: str, profile_name: str = None, hook: str = None):
@@ -667,9 +870,11 @@ class GitCtx:
             print(f"❌ Profile '{profile_name}' not found")
             return
         
-        # Resolve the file path
-        source_path = Path(file_path).expanduser().resolve()
-        if not source_path.exists():
+        # Resolve the file path; the stat doubles as the existence check
+        source_path = Path(os.path.realpath(os.path.expanduser(file_path)))
+        try:
+            file_stat = source_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
             print(f"❌ File not found: {source_path}")
             return
         
@@ -678,7 +883,7 @@ class GitCtx:
             sys.exit(1)
 
         # Check if file is within home directory
-        home_path = Path.home().resolve()
+        home_path = self._home_resolved
         try:
             relative_path = source_path.relative_to(home_path)
         except ValueError:
@@ -688,7 +893,6 @@ class GitCtx:
             return
         
         # Get file permissions
-        file_stat = source_path.stat()
         file_mode = oct(file_stat.st_mode)[-3:]  # Get last 3 digits (e.g., "600")
 
         # Check for potentially unsafe permissions
@@ -698,8 +902,8 @@ class GitCtx:
             print(f"   File: {source_path}")
             if source_path.suffix in ['.pem', '.key'] or 'ssh' in str(source_path):
                 print("   This appears to be a sensitive file (SSH key, certificate, etc.)")
-                confirm = input("   Continue adding this file? (y/N): ")
-                if confirm.lower() != 'y':
+                confirm = self._read_char_yn("   Continue adding this file? (y/N): ")
+                if confirm != 'y':
                     print("❌ File addition cancelled")
                     return
 
@@ -748,7 +952,7 @@ class GitCtx:
                 file_mode = oct(os.stat(source_path).st_mode)[-3:]
 
         # Copy the file
-        shutil.copy2(source_path, dest_file)
+        self._copy_file(source_path, dest_file)
 
         # Create file info dict
         file_info = {
@@ -765,7 +969,7 @@ class GitCtx:
         
         self._save_metadata(metadata)
 
-        self._commit_changes(f"{action} file {original_filename} to profile {profile_name}")
+        self._commit_changes(f"{action} file {original_filename} to profile {profile_name}", [f"profiles/{profile_name}"])
         print(f"✅ {action} '{original_filename}' to profile '{profile_name}'")
         print(f"📁 File path: ~/{relative_path}")
         print(f"🔒 Permissions: {file_mode}")
@@ -808,7 +1012,7 @@ class GitCtx:
         editor = os.environ.get('EDITOR', 'vim')
         try:
             subprocess.run([editor, str(file_path)], check=True)
-            self._commit_changes(f"Edit file '{file}' in profile '{profile_name}'")
+            self._commit_changes(f"Edit file '{file}' in profile '{profile_name}'", [f"profiles/{profile_name}/{file}"])
             print(f"✅ Edited '{file}' in '{profile_name}'")
         except subprocess.CalledProcessError:
             print(f"❌ Failed to edit '{file}'")
@@ -848,19 +1052,19 @@ class GitCtx:
 
         del files[file]
         self._save_metadata(metadata)
-        self._commit_changes(f"Removed file '{file}' from profile '{profile_name}'")
+        self._commit_changes(f"Removed file '{file}' from profile '{profile_name}'", [f"profiles/{profile_name}/{file}"])
         print(f"🗑️ Removed '{file}' from '{profile_name}'")
 
     def push_repo(self):
         try:
-            subprocess.run(['git', 'push'], cwd=self.config_dir, check=True)
+            subprocess.run(['git', 'push'], cwd=self.config_dir_str, check=True)
             print("🚀 Pushed changes to remote")
         except subprocess.CalledProcessError:
             print("❌ Failed to push changes")
 
     def pull_repo(self):
         try:
-            subprocess.run(['git', 'pull'], cwd=self.config_dir, check=True)
+            subprocess.run(['git', 'pull'], cwd=self.config_dir_str, check=True)
             print("📥 Pulled latest changes from remote")
         except subprocess.CalledProcessError:
             print("❌ Failed to pull changes")
@@ -876,14 +1080,14 @@ class GitCtx:
             if isinstance(file_info, dict) and file_info.get('hook') == hook_type:
                 # Get the actual file path
                 relative_path = file_info.get('path')
-                script_path = Path.home() / relative_path
+                script_path = self._home / relative_path
                 
                 if script_path.exists() and os.access(script_path, os.X_OK):
                     try:
                         print(f"-----")
                         print(f"🔧 Running {hook_type} hook: {script_path.name}")
                         result = subprocess.run([str(script_path)], 
-                                            cwd=Path.home(), 
+                                            cwd=self._home, 
                                             check=True, 
                                             capture_output=True)  # Let output show
                         hooks_executed.append(script_path.name)
@@ -897,18 +1101,28 @@ class GitCtx:
         if hooks_executed:
             print(f"✅ Executed {hook_type} hooks: {', '.join(hooks_executed)}\n-----")
 
-def main():
+def build_parser(command: Optional[str] = None):
+    """Build the argument parser, returning it along with the command group parsers.
+
+    If command is given, only that command's arguments and subcommands are registered;
+    the other commands are added without arguments so top-level help still lists them.
+    """
     parser = argparse.ArgumentParser(description='gitctx - Git Profile Manager')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
+
+    def wanted(name: str) -> bool:
+        return command is None or command == name
     
     # Initialize command
     init_parser = subparsers.add_parser('init', help='Initialize gitctx repository (alias)')
-    init_parser.add_argument('repo_url', nargs='?', help='Optional repository URL to clone')
+    if wanted('init'):
+        init_parser.add_argument('repo_url', nargs='?', help='Optional repository URL to clone')
     
     # Switch profile
     switch_parser = subparsers.add_parser('switch', help='Switch to a profile (alias)')
-    switch_parser.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
-    switch_parser.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
+    if wanted('switch'):
+        switch_parser.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
+        switch_parser.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
 
 
     # Status
@@ -916,80 +1130,94 @@ def main():
 
     # Profile management commands
     profile_parser = subparsers.add_parser('profile', help='Grouped profile management commands')
-    profile_subparsers = profile_parser.add_subparsers(dest='profile_command', help='Profile commands')
-    
-    # Add new profile
-    add_new = profile_subparsers.add_parser('add-new', help='Create new git profile')
-    add_new.add_argument('name', help='Profile name')
-    add_new.add_argument('--user-name', required=True, help='Git user name')
-    add_new.add_argument('--user-email', required=True, help='Git user email')
-    
-    # Add current profile
-    add_current = profile_subparsers.add_parser('add-current', help='Add current git configuration as a profile')
-    add_current.add_argument('name', help='Profile name')
+    if wanted('profile'):
+        profile_subparsers = profile_parser.add_subparsers(dest='profile_command', help='Profile commands')
+        
+        # Add new profile
+        add_new = profile_subparsers.add_parser('add-new', help='Create new git profile')
+        add_new.add_argument('name', help='Profile name')
+        add_new.add_argument('--user-name', required=True, help='Git user name')
+        add_new.add_argument('--user-email', required=True, help='Git user email')
+        
+        # Add current profile
+        add_current = profile_subparsers.add_parser('add-current', help='Add current git configuration as a profile')
+        add_current.add_argument('name', help='Profile name')
 
-    # List profiles
-    profile_subparsers.add_parser('list', help='List all profiles')
-    
-    # Switch profile
-    switch = profile_subparsers.add_parser('switch', help='Switch to a profile')
-    switch.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
-    switch.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
+        # List profiles
+        profile_subparsers.add_parser('list', help='List all profiles')
+        
+        # Switch profile
+        switch = profile_subparsers.add_parser('switch', help='Switch to a profile')
+        switch.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
+        switch.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
 
-    
-    # List profile files
-    inspect = profile_subparsers.add_parser('inspect', help='List all files in a profile')
-    inspect.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
-    
-    # Edit profile
-    edit = profile_subparsers.add_parser('edit', help='Edit a profile')
-    edit.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
-    
-    # Remove profile
-    remove = profile_subparsers.add_parser('rm', help='Remove git profile')
-    remove.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
+        
+        # List profile files
+        inspect = profile_subparsers.add_parser('inspect', help='List all files in a profile')
+        inspect.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
+        
+        # Edit profile
+        edit = profile_subparsers.add_parser('edit', help='Edit a profile')
+        edit.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
+        
+        # Remove profile
+        remove = profile_subparsers.add_parser('rm', help='Remove git profile')
+        remove.add_argument('name', nargs='?', help='Profile name (optional, will prompt if not provided)')
     
     # File management commands
     file_parser = subparsers.add_parser('file', help='Grouped file management commands')
-    file_subparsers = file_parser.add_subparsers(dest='file_command', help='File commands')
-    
-    # Add file to profile
-    add_file = file_subparsers.add_parser('add', help='Add a file to a profile')
-    add_file.add_argument('file', help='Path to file to add')
-    add_file.add_argument('--profile', help='Profile name (defaults to active profile)')
-    add_file.add_argument("--hook", nargs="?", const=True, help="Set the hook type (pre-apply or post-apply)")
-
-    # Edit file in profile
-    edit_file = file_subparsers.add_parser('edit', help='Edit a file in a profile')
-    edit_file.add_argument('file', nargs='?', help='File name to edit (optional, fzf prompt if omitted)')
-    edit_file.add_argument('--profile', help='Profile name (defaults to active profile)')
-
-    # Remove file from profile
-    rm_file = file_subparsers.add_parser('rm', help='Remove file from profile')
-    rm_file.add_argument('file', nargs='?', help='File name to remove (optional, fzf prompt if omitted)')
-    rm_file.add_argument('--profile', help='Profile name (defaults to active profile)')
+    if wanted('file'):
+        file_subparsers = file_parser.add_subparsers(dest='file_command', help='File commands')
+        
+        # Add file to profile
+        add_file = file_subparsers.add_parser('add', help='Add a file to a profile')
+        add_file.add_argument('file', help='Path to file to add')
+        add_file.add_argument('--profile', help='Profile name (defaults to active profile)')
+        add_file.add_argument("--hook", nargs="?", const=True, help="Set the hook type (pre-apply or post-apply)")
+
+        # Edit file in profile
+        edit_file = file_subparsers.add_parser('edit', help='Edit a file in a profile')
+        edit_file.add_argument('file', nargs='?', help='File name to edit (optional, fzf prompt if omitted)')
+        edit_file.add_argument('--profile', help='Profile name (defaults to active profile)')
+
+        # Remove file from profile
+        rm_file = file_subparsers.add_parser('rm', help='Remove file from profile')
+        rm_file.add_argument('file', nargs='?', help='File name to remove (optional, fzf prompt if omitted)')
+        rm_file.add_argument('--profile', help='Profile name (defaults to active profile)')
 
     # Config/git repository commands
     config_parser = subparsers.add_parser('config', help='Grouped cn¡onfiguration management commands')
-    config_subparsers = config_parser.add_subparsers(dest='config_command', help='Config commands')
-    
-    # Init config
-    init_config = config_subparsers.add_parser('init', help='Initialize gitctx repository')
-    init_config.add_argument('repo_url', nargs='?', help='Optional repository URL to clone')
+    if wanted('config'):
+        config_subparsers = config_parser.add_subparsers(dest='config_command', help='Config commands')
+        
+        # Init config
+        init_config = config_subparsers.add_parser('init', help='Initialize gitctx repository')
+        init_config.add_argument('repo_url', nargs='?', help='Optional repository URL to clone')
 
-    # Push and pull from git
-    config_subparsers.add_parser('push', help='Push changes in gitctx repository')
-    config_subparsers.add_parser('pull', help='Pull latest changes in gitctx repository')
-    
-    # Apply profile configuration
-    apply_parser = config_subparsers.add_parser('apply', help='Re-apply files from the current active profile')
-    apply_parser.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
+        # Push and pull from git
+        config_subparsers.add_parser('push', help='Push changes in gitctx repository')
+        config_subparsers.add_parser('pull', help='Pull latest changes in gitctx repository')
+        
+        # Apply profile configuration
+        apply_parser = config_subparsers.add_parser('apply', help='Re-apply files from the current active profile')
+        apply_parser.add_argument("--no-hooks", action='store_true', required=False, help="Skip applying hooks")
+
+    group_parsers = {'profile': profile_parser, 'file': file_parser, 'config': config_parser}
+    return parser, group_parsers
 
-    args = parser.parse_args()
+def main():
+    if sys.argv[1:] == ['status']:
+        # Fast path: plain `status` takes no arguments, so skip building the parser tree
+        args = argparse.Namespace(command='status')
+    else:
+        # Only the invoked command's subparsers are needed; options like -h get the full tree
+        command = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith('-') else None
+        parser, group_parsers = build_parser(command)
+        args = parser.parse_args()
     
-    if not args.command:
-        parser.print_help()
-        return
+        if not args.command:
+            parser.print_help()
+            return
     
     gitctx = GitCtx()
     
@@ -998,7 +1226,7 @@ def main():
             gitctx.initialize_repo(getattr(args, 'repo_url', None))
         elif args.command == 'profile':
             if not args.profile_command:
-                profile_parser.print_help()
+                group_parsers['profile'].print_help()
                 return
             if args.profile_command == 'add-new':
                 gitctx.add_new_profile(args.name, args.user_name, args.user_email)
@@ -1020,7 +1248,7 @@ def main():
             gitctx.switch_profile(args.name, args.no_hooks)
         elif args.command == 'file':
             if not args.file_command:
-                file_parser.print_help()
+                group_parsers['file'].print_help()
                 return
             if args.file_command == 'add':
                 gitctx.add_file(args.file, args.profile, args.hook)
@@ -1030,7 +1258,7 @@ def main():
                 gitctx.remove_file(args.file, args.profile)
         elif args.command == 'config':
             if not args.config_command:
-                config_parser.print_help()
+                group_parsers['config'].print_help()
                 return
             if args.config_command == 'init':
                 gitctx.initialize_repo(getattr(args, 'repo_url', None))
@@ -1040,6 +1268,7 @@ def main():
                 gitctx.pull_repo()
             elif args.config_command == 'apply':
                 gitctx.apply_active_profile(args.no_hooks)
+        gitctx.flush()
     except KeyboardInterrupt:
         print("\n❌ Operation cancelled")
         sys.exit(1)